@@ -1,14 +1,45 @@
 """H.A.N.N.A.H: Heuristically Aiding Neural Network based AI for Humans
 """
 
-from ._logging import *
-from ._io import *
-from .exceptions import *
-from .utils import *
+from ._logging import FileHandler
+from ._logging import Handler
+from ._logging import Logger
+from ._logging import QueueHandler
+from ._logging import RotatingFileHandler
+from ._logging import StackFormatter
+from ._logging import StreamHandler
+from ._logging import TTYInspector
+from ._logging import TimedRotatingFileHandler
+from ._logging import create_logger
+from ._logging import get_logger
+from ._logging import refresh_cwd
+from ._logging import stderr
+from ._logging import stdout
+from .exceptions import HannahException
+from .exceptions import UnsupportedOperation
+from .utils import SingletonMeta
 
 try:
     from ._version import __version__
 except ImportError:
     __version__ = "Unknown version"
 
-__all__ = _logging.__all__ + _io.__all__ + utils.__all__ + exceptions.__all__  # type: ignore
+__all__ = [
+    "FileHandler",
+    "Handler",
+    "HannahException",
+    "Logger",
+    "QueueHandler",
+    "RotatingFileHandler",
+    "SingletonMeta",
+    "StackFormatter",
+    "StreamHandler",
+    "TTYInspector",
+    "TimedRotatingFileHandler",
+    "UnsupportedOperation",
+    "create_logger",
+    "get_logger",
+    "refresh_cwd",
+    "stderr",
+    "stdout",
+]
@@ -1,13 +1,22 @@
 """Logging: Capture and control the logs."""
 
+import atexit
+import copy
 import logging
 import logging.handlers
 import os
+import queue
+import re
 import sys
+import time
 from datetime import timedelta
 from types import TracebackType
 from typing import IO
 from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
 from typing import MutableMapping
 from typing import Optional
 from typing import Tuple
@@ -17,6 +26,7 @@ __all__ = [
     "FileHandler",
     "Handler",
     "Logger",
+    "QueueHandler",
     "RotatingFileHandler",
     "StackFormatter",
     "StreamHandler",
@@ -24,6 +34,7 @@ __all__ = [
     "TimedRotatingFileHandler",
     "create_logger",
     "get_logger",
+    "refresh_cwd",
     "stderr",
     "stdout",
 ]
@@ -37,7 +48,13 @@ BASIC_FORMAT = (
 )
 DATE_FORMAT = "%b %d %H:%M:%S"
 
-logging._levelToName = {
+_HUES = re.compile(r"%\((?:color|gray|reset)\)[-#0 +]*\d*s")
+_RESERVED = frozenset(("exc_info", "extra", "stack_info", "stacklevel"))
+_CWD = os.getcwd()
+_SEPARATORS = str.maketrans(os.path.sep, ".")
+_STACKS: Dict[Tuple[str, str], str] = {}
+
+_LEVELS = {
     60: "TRACE",
     50: "FATAL",
     40: "ERROR",
@@ -73,9 +90,9 @@ class StackFormatter(logging.Formatter):
         20: "\x1b[38;5;41m",
         10: "\x1b[38;5;14m",
         00: "\x1b[38;5;14m",
-        "gray": "\x1b[38;5;242m",
-        "reset": "\x1b[0m",
     }
+    gray = "\x1b[38;5;242m"
+    reset = "\x1b[0m"
     attrs = ("color", "gray", "reset")
 
     def __init__(
@@ -87,8 +104,13 @@ class StackFormatter(logging.Formatter):
             fmt = BASIC_FORMAT
         if not datefmt:
             datefmt = DATE_FORMAT
-        self.fmt = fmt
-        self.datefmt = datefmt
+        super().__init__(fmt, datefmt)
+        self._plain_style = logging.PercentStyle(_HUES.sub("", fmt))
+        self._empty = dict.fromkeys(self.attrs, "")
+        self._hue_cache = {
+            level: {"color": color, "gray": self.gray, "reset": self.reset}
+            for level, color in self.hues.items()
+        }
 
     def colorize(self, record: logging.LogRecord) -> None:
         """Add colors to the logging levels by manipulating record.
@@ -101,23 +123,10 @@ class StackFormatter(logging.Formatter):
 
         """
 
-        if getattr(record, "isatty", False):
-            setattr(record, "color", self.hues[record.levelno])
-            setattr(record, "gray", self.hues["gray"])
-            setattr(record, "reset", self.hues["reset"])
+        if record.__dict__.get("isatty", False):
+            record.__dict__.update(self._hue_cache[record.levelno])
         else:
-            for attr in self.attrs:
-                setattr(record, attr, "")
-
-    def decolorize(self, record: logging.LogRecord) -> None:
-        """Remove ``color`` and ``reset`` attributes from a record.
-
-        :param record: Instance of the logged event.
-
-        """
-
-        for attr in self.attrs:
-            delattr(record, attr)
+            record.__dict__.update(self._empty)
 
     def formatException(self, ei: Union[SysExcInfoType, TupleOfNone]) -> str:
         r"""Format exception information as text.
@@ -151,40 +160,60 @@ class StackFormatter(logging.Formatter):
 
             If called from a module, the base path of the module would
             be used else "REPL" would be returned for the interpreter
-            (stdin) based input.
+            (stdin) based input. The formatted stacks are cached, call
+            :py:func:`refresh_cwd` after changing the working directory.
 
         """
 
+        key = (path, func)
+        stack = _STACKS.get(key)
+        if stack is not None:
+            return stack
         if path == "<stdin>":
             return "REPL"
-        abspath = "site-packages" if "site-packages" in path else os.getcwd()
-        path = path.split(abspath)[-1].replace(os.path.sep, ".")[
+        abspath = "site-packages" if "site-packages" in path else _CWD
+        stack = path.rpartition(abspath)[2].translate(_SEPARATORS)[
             path[0] != ":" : -3
         ]
         if func not in ("<module>", "<lambda>"):
-            path += f".{func}"
-        return path
+            stack += f".{func}"
+        _STACKS[key] = stack
+        return stack
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as text.
 
         If any exception is caught then, it is formatted using the
         :py:meth:`hannah.logging.StackFormatter.formatException` and
-        replaced with the original message.
+        replaced with the original message. Records which are not
+        written to a TTY skip the colorization and are formatted without
+        the color placeholders.
 
         :param record: Instance of the logged event.
         :return: Captured and formatted output log string.
 
         """
 
-        setattr(record, "stack", self.stack(record.pathname, record.funcName))
+        attrs = record.__dict__
+        attrs["stack"] = self.stack(record.pathname, record.funcName)
         if record.exc_info:
             record.msg = self.formatException(record.exc_info)
             record.exc_info = record.exc_text = None
-        self.colorize(record)
-        text = logging.Formatter(self.fmt, self.datefmt).format(record)
-        self.decolorize(record)
-        return text
+        if attrs.get("isatty", False):
+            self.colorize(record)
+        return super().format(record)
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        """Format the record using the colored or the plain style.
+
+        :param record: Instance of the logged event.
+        :return: Formatted output log string.
+
+        """
+
+        if record.__dict__.get("isatty", False):
+            return self._style.format(record)
+        return self._plain_style.format(record)
 
 
 class Handler(object):
@@ -224,6 +253,115 @@ class Handler(object):
         logger.addHandler(self.handler)
 
 
+class _BufferedStream(object):
+    """Mixin which buffers the writes of a file based handler.
+
+    The file is opened with a larger buffer and the records are flushed
+    at most once every ``flush_interval`` seconds instead of after every
+    record. Explicit :py:meth:`flush` calls and closing the handler
+    always write the pending records.
+
+    """
+
+    buffer_size = 65536
+    flush_interval = 0.05
+    stream: Any
+    _flushed = 0.0
+
+    def _open(self) -> Any:
+        """Open the current base file with a larger write buffer."""
+
+        return open(
+            self.baseFilename,  # type: ignore
+            self.mode,  # type: ignore
+            self.buffer_size,
+            self.encoding,  # type: ignore
+            getattr(self, "errors", None),
+        )
+
+    def flush(self) -> None:
+        """Flush the stream."""
+
+        self._flushed = time.monotonic()
+        super().flush()  # type: ignore
+
+    def write(self, msg: str) -> None:
+        """Write the message, flushing if the flush interval elapsed.
+
+        :param msg: Formatted message to write to the stream.
+
+        """
+
+        if self.stream is None:
+            self.stream = self._open()
+        self.stream.write(msg)
+        if time.monotonic() - self._flushed >= self.flush_interval:
+            self.flush()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Emit a record.
+
+        :param record: Instance of the logged event.
+
+        """
+
+        try:
+            self.write(self.format(record) + self.terminator)  # type: ignore
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)  # type: ignore
+
+
+class _BufferedFileHandler(_BufferedStream, logging.FileHandler):
+    """Buffered variant of :py:class:`logging.FileHandler`."""
+
+    pass
+
+
+class _BufferedRotatingFileHandler(
+    _BufferedStream, logging.handlers.RotatingFileHandler
+):
+    """Buffered variant of :py:class:`logging.handlers.RotatingFileHandler`.
+
+    The size of the current file is tracked in memory as the standard
+    implementation seeks the stream, and thus flushes it, per record.
+    Like the standard implementation, files which are not regular files
+    such as ``/dev/null`` are never rolled over.
+
+    """
+
+    _size = 0
+    _regular = True
+
+    def _open(self) -> Any:
+        """Open the current base file and note its size."""
+
+        stream = super()._open()
+        self._size = stream.seek(0, 2)
+        self._regular = os.path.isfile(self.baseFilename)
+        return stream
+
+    def write(self, msg: str) -> None:
+        """Write the message, doing a rollover if it would not fit.
+
+        :param msg: Formatted message to write to the stream.
+
+        """
+
+        if self.stream is None:
+            self.stream = self._open()
+        size = len(msg.encode(self.stream.encoding, self.stream.errors))
+        if (
+            self.maxBytes > 0
+            and self._regular
+            and self._size + size >= self.maxBytes
+        ):
+            self.doRollover()
+        super().write(msg)
+        self._size += size
+
+
 class FileHandler(Handler):
     """Handler instance which writes logging records to disk files.
 
@@ -235,6 +373,11 @@ class FileHandler(Handler):
     :param level: Logging level of the logged event, defaults to None.
     :param formatter: Formatter instance to use for formatting record,
         defaults to :py:class:`StackFormatter`.
+    :param buffered: Boolean to buffer the writes and flush them
+        periodically instead of per record, defaults to False. The
+        pending records are written by the next record logged after
+        the flush interval, by :py:meth:`logging.Handler.flush` or on
+        close, so a quiet logger may hold them back until then.
 
     .. seealso::
 
@@ -250,10 +393,12 @@ class FileHandler(Handler):
         encoding: Optional[str] = None,
         level: Optional[Union[int, str]] = None,
         formatter: logging.Formatter = StackFormatter,  # type: ignore
+        buffered: bool = False,
     ) -> None:
         """Open the file and use it as the stream for logging."""
 
-        handler = logging.FileHandler(filename, mode, encoding)
+        cls = _BufferedFileHandler if buffered else logging.FileHandler
+        handler = cls(filename, mode, encoding)
         super().__init__(handler, level, formatter)
 
 
@@ -276,6 +421,11 @@ class RotatingFileHandler(Handler):
     :param level: Logging level of the logged event, defaults to None.
     :param formatter: Formatter instance to use for formatting record,
         defaults to :py:class:`StackFormatter`.
+    :param buffered: Boolean to buffer the writes and flush them
+        periodically instead of per record, defaults to False. The
+        pending records are written by the next record logged after
+        the flush interval, by :py:meth:`logging.Handler.flush` or on
+        close, so a quiet logger may hold them back until then.
 
     .. note::
 
@@ -308,12 +458,16 @@ class RotatingFileHandler(Handler):
         encoding: Optional[str] = None,
         level: Optional[Union[int, str]] = None,
         formatter: logging.Formatter = StackFormatter,  # type: ignore
+        buffered: bool = False,
     ) -> None:
         """Open the file and use it as the stream for logging."""
 
-        handler = logging.handlers.RotatingFileHandler(
-            filename, mode, max_bytes, backups, encoding
+        cls = (
+            _BufferedRotatingFileHandler
+            if buffered
+            else logging.handlers.RotatingFileHandler
         )
+        handler = cls(filename, mode, max_bytes, backups, encoding)
         super().__init__(handler, level, formatter)
 
     def do_rollover(self) -> Any:
@@ -395,12 +549,47 @@ class TTYInspector(logging.StreamHandler):
     """StreamHandler instance which inspects if the output stream is a
     TTY.
 
+    The stream is probed once when the handler is created (or when the
+    stream is replaced) rather than on every logged event.
+
+    :param stream: IO stream, defaults to None.
+
     .. seealso::
 
         :py:meth:`logging.StreamHandler.format()`
 
     """
 
+    def __init__(self, stream: Optional[IO[str]] = None) -> None:
+        """Initialize the handler and probe the stream."""
+
+        super().__init__(stream)
+        self._isatty = self.probe()
+
+    def probe(self) -> bool:
+        """Check if the current stream is attached to a TTY.
+
+        :return: True if the stream is a TTY, False otherwise.
+
+        """
+
+        try:
+            return bool(getattr(self.stream, "isatty", lambda: False)())
+        except ValueError:
+            return False
+
+    def setStream(self, stream: IO[str]) -> Optional[IO[str]]:
+        """Set the instance's stream and probe it again.
+
+        :param stream: IO stream to replace the current one.
+        :return: Old stream if the stream was changed, else None.
+
+        """
+
+        result = super().setStream(stream)  # type: ignore
+        self._isatty = self.probe()
+        return result  # type: ignore
+
     def format(self, record: logging.LogRecord) -> str:
         """Add hint if the specified stream is a TTY.
 
@@ -409,15 +598,9 @@ class TTYInspector(logging.StreamHandler):
 
         """
 
-        if hasattr(self.stream, "isatty"):
-            try:
-                setattr(record, "isatty", self.stream.isatty())
-            except ValueError:
-                setattr(record, "isatty", False)
-        else:
-            setattr(record, "isatty", False)
+        record.__dict__["isatty"] = self._isatty
         strict = super().format(record)
-        delattr(record, "isatty")
+        del record.__dict__["isatty"]
         return strict
 
 
@@ -448,6 +631,86 @@ class StreamHandler(Handler):
         super().__init__(TTYInspector(stream), level, formatter)
 
 
+class _QueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler instance which owns the listener draining its
+    queue.
+
+    The records stay in the same process, so only the message is merged
+    with its arguments. The exception information is preserved for the
+    formatters of the listener's handlers.
+
+    """
+
+    listener: Optional[logging.handlers.QueueListener] = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Merge the message and its arguments on a copy of the record.
+
+        :param record: Instance of the logged event.
+        :return: Copy of the record to enqueue.
+
+        """
+
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def close(self) -> None:
+        """Stop the listener and close the handlers it dispatches to."""
+
+        atexit.unregister(self.close)
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+        super().close()
+
+
+class QueueHandler(Handler):
+    """Handler instance which hands logging records over to a background
+    thread.
+
+    The records are put on a queue by the logging thread and dispatched
+    to the actual handlers by a :py:class:`logging.handlers.QueueListener`
+    so that the caller never blocks on the underlying streams.
+
+    :param handlers: Handler instances to dispatch the records to.
+    :param level: Logging level of the logged event, defaults to None.
+
+    .. note::
+
+        The listener is stopped, flushing all the pending records, when
+        the handler is closed or when the interpreter exits.
+
+    .. seealso::
+
+        :py:class:`Handler`
+        :py:class:`logging.handlers.QueueHandler`
+        :py:class:`logging.handlers.QueueListener`
+
+    """
+
+    def __init__(
+        self,
+        handlers: Iterable[Handler],
+        level: Optional[Union[int, str]] = None,
+    ) -> None:
+        """Initialize the handler and start the listener."""
+
+        records: queue.Queue = queue.Queue(-1)  # type: ignore
+        handler = _QueueHandler(records)
+        handler.listener = logging.handlers.QueueListener(
+            records,
+            *(each.handler for each in handlers),
+            respect_handler_level=True,
+        )
+        handler.listener.start()
+        atexit.register(handler.close)
+        super().__init__(handler, level, None)  # type: ignore
+
+
 stderr = StreamHandler()
 stdout = StreamHandler(sys.stdout)
 
@@ -458,12 +721,30 @@ class Logger(logging.LoggerAdapter):
     This instance uses a ``LoggerAdapter`` which makes it easier to
     specify contextual information in logging output.
 
+    .. note::
+
+        The level methods check if the level is enabled before doing
+        anything else, so suppressed calls are as cheap as possible.
+        Pass the message arguments separately instead of formatting
+        them upfront, i.e. ``logger.info("Hello %s", name)`` rather
+        than ``logger.info(f"Hello {name}")``. The message is then
+        interpolated only if the record is actually emitted.
+
     .. seealso::
 
         :py:meth:`logging.LoggerAdapter.process`
 
     """
 
+    def __init__(
+        self, logger: logging.Logger, extra: Optional[Mapping[str, Any]] = None
+    ) -> None:
+        """Initialize the adapter and bind the logger's hot methods."""
+
+        super().__init__(logger, extra or {})
+        self._log = logger._log  # type: ignore
+        self._enabled = logger.isEnabledFor
+
     def process(
         self, msg: Any, kwargs: MutableMapping[str, Any]
     ) -> Tuple[Any, MutableMapping[str, Any]]:
@@ -480,50 +761,82 @@ class Logger(logging.LoggerAdapter):
 
         """
 
-        extra = self.extra.copy()  # type: ignore
-        if "extra" in kwargs:
-            extra.update(kwargs.pop("extra"))
-        for name in kwargs.keys():
-            if name == "exc_info":
-                continue
-            extra[name] = kwargs.pop(name)
+        extra = {**self.extra, **kwargs.pop("extra", {})}  # type: ignore
+        extra.update(
+            {
+                name: kwargs.pop(name)
+                for name in list(kwargs)
+                if name not in _RESERVED
+            }
+        )
         kwargs["extra"] = extra
         return msg, kwargs
 
     def debug(self, msg: Any, *args: Any, **kwargs: Any) -> None:
         """Log message with ``DEBUG`` severity level."""
 
-        self.logger._log(10, msg, args, **kwargs)
+        if self._enabled(10):
+            self._log(10, msg, args, **kwargs)
 
     def info(self, msg: Any, *args: Any, **kwargs: Any) -> None:
         """Log message with ``INFO`` severity level."""
 
-        self.logger._log(20, msg, args, **kwargs)
+        if self._enabled(20):
+            self._log(20, msg, args, **kwargs)
 
     def warning(self, msg: Any, *args: Any, **kwargs: Any) -> None:
         """Log message with ``WARNING`` severity level."""
 
-        self.logger._log(30, msg, args, **kwargs)
+        if self._enabled(30):
+            self._log(30, msg, args, **kwargs)
 
     def error(self, msg: Any, *args: Any, **kwargs: Any) -> None:
         """Log message with ``ERROR`` severity level."""
 
-        self.logger._log(40, msg, args, **kwargs)
+        if self._enabled(40):
+            self._log(40, msg, args, **kwargs)
 
     def critical(self, msg: Any, *args: Any, **kwargs: Any) -> None:
         """Log message with ``CRITICAL`` severity level."""
 
-        self.logger._log(50, msg, args, **kwargs)
+        if self._enabled(50):
+            self._log(50, msg, args, **kwargs)
 
     def exception(self, msg: Any, *args: Any, **kwargs: Any) -> None:
         """Log message with ``CRITICAL`` severity level."""
 
-        self.logger._log(60, msg, args, True, **kwargs)
+        if self._enabled(60):
+            self._log(60, msg, args, exc_info=True, **kwargs)
 
     fatal = critical
     warn = warning
 
 
+def refresh_cwd() -> None:
+    """Refresh the working directory used for formatting the stacks.
+
+    The working directory is resolved once on import. Call this after
+    :py:func:`os.chdir` to format the stacks relative to the new one.
+
+    """
+
+    global _CWD
+    _CWD = os.getcwd()
+    _STACKS.clear()
+
+
+_CONFIG: List[Any] = [None, None]
+_FORMATTERS: Dict[Tuple[Optional[str], Optional[str]], StackFormatter] = {}
+_LOGGERS: Dict[Optional[str], Logger] = {}
+
+
+def _install_levels() -> None:
+    """Register the level names used by H.A.N.N.A.H."""
+
+    for level, name in _LEVELS.items():
+        logging.addLevelName(level, name)
+
+
 def get_logger(name: Optional[str] = None, **kwargs: Any) -> Logger:
     """Return a logger with the specified name.
 
@@ -545,41 +858,65 @@ def create_logger(**kwargs: Any) -> Logger:
     The default behavior is to create a ``RotatingFileHandler`` and
     ``StreamHandler`` which writes to a output log file and sys.stderr
     respectively and then set level for logging events to the handlers.
+    If ``queue`` is True, the handlers are wrapped in a
+    :py:class:`QueueHandler` so the records are written by a background
+    thread instead.
 
     :returns: Logger instance.
 
     .. note::
 
         This implementation is based on :py:func:`logging.basicConfig`.
+        Repeated calls with the same arguments reuse the handlers and
+        the logger created by the first call, as long as the handlers
+        of the root logger were not changed in between. The level of
+        the root logger and the capturing of warnings are applied again
+        on every call.
 
     """
 
+    _install_levels()
     root = logging.getLogger(None)
-    for handler in root.handlers[:]:
-        root.removeHandler(handler)
-        handler.close()
-    if len(root.handlers) == 0:
-        level = kwargs.get("level", logging.INFO)
-        root.setLevel(level)
+    stream = kwargs.get("stream", None) or sys.stderr
+    name = kwargs.pop("name", None)
+    key = (stream, sorted(kwargs.items()))
+    level = kwargs.get("level", logging.INFO)
+    root.setLevel(level)
+    logging.captureWarnings(kwargs.get("capture_warnings", True))
+    if key != _CONFIG[0] or root.handlers != _CONFIG[1]:
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
         format = kwargs.get("format", None)
         datefmt = kwargs.get("datefmt", None)
-        formatter = StackFormatter(format, datefmt)
+        formatter = _FORMATTERS.get((format, datefmt))
+        if formatter is None:
+            formatter = StackFormatter(format, datefmt)
+            _FORMATTERS[(format, datefmt)] = formatter
         handlers = kwargs.get("handlers", None)
         if handlers is None:
             handlers = []
-            stream = kwargs.get("stream", None)
             handlers.append(StreamHandler(stream, level, formatter))
             filename = kwargs.get("filename", None)
             filemode = kwargs.get("filemode", "a")
+            buffered = kwargs.get("buffered", False)
             if filename:
                 handlers.append(
                     RotatingFileHandler(
-                        filename, filemode, level=level, formatter=formatter
+                        filename,
+                        filemode,
+                        level=level,
+                        formatter=formatter,
+                        buffered=buffered,
                     )
                 )
+        if kwargs.get("queue", False):
+            handlers = [QueueHandler(handlers)]
         for handler in handlers:
             handler.add_handler(root)  # type: ignore
-        capture_warnings = kwargs.get("capture_warnings", True)
-        logging.captureWarnings(capture_warnings)
-    name = kwargs.get("name", None)
-    return get_logger(name, **kwargs)
+        _CONFIG[:] = key, root.handlers[:]
+        _LOGGERS.clear()
+    logger = _LOGGERS.get(name)
+    if logger is None:
+        logger = _LOGGERS[name] = get_logger(name, **kwargs)
+    return logger
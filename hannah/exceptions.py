@@ -3,9 +3,11 @@ Exceptions: Collections of all the exceptions raised by H.A.N.N.A.H.
 
 """
 
+import functools
 import os
 import textwrap
 from typing import Any
+from typing import Optional
 
 __all__ = [
     "HannahException",
@@ -31,19 +33,30 @@ class HannahException(Exception):
 
     """
 
+    msg = ""
+
     def __init__(self, valid: bool = False, **kwargs: Any) -> None:
 
         for name, value in kwargs.items():
             setattr(self, name, value)
-        self.msg = self.msg if self.msg else ""  # type: ignore
-        if not valid and self.msg:
-            self.msg += self.report()
+        self._valid = valid
+        self._rendered: Optional[str] = None
         super().__init__(self.msg)
 
     def __str__(self) -> str:
-        """Return formatted message output."""
+        """Return formatted message output.
+
+        The message, and the bug report for the invalid exceptions, is
+        rendered on the first call and reused afterwards.
+
+        """
 
-        return self.msg.format(**vars(self))  # type: ignore
+        if self._rendered is None:
+            rendered = self.msg.format(**vars(self)) if self.msg else ""
+            if not self._valid and rendered:
+                rendered += self.report()
+            self._rendered = rendered
+        return self._rendered
 
     def report(self) -> str:
         """Return bug report warning."""
@@ -52,17 +65,24 @@ class HannahException(Exception):
             width = os.get_terminal_size().columns
         except OSError:
             width = 80
-        title = " YIKES! There's a bug! ".center(width, "-")
-        msg = (
-            "If you are seeing this, then there is something wrong with "
-            "H.A.N.N.A.H and not your code. Please report this bug here: "
-            '"https://github.com/kaamiki/hannah/issues/new" so that we can '
-            "fix the issue at the earliest. It would be a great help if you "
-            "could provide the steps, traceback information or even a sample "
-            "code for reproducing this bug while submitting an issue."
-        )
-        wrapper = textwrap.TextWrapper(width)
-        return f"\n\n{title}\n{wrapper.fill(msg)}\n\n"
+        return _render_report(width)
+
+
+@functools.lru_cache(maxsize=8)
+def _render_report(width: int) -> str:
+    """Return bug report warning wrapped for the terminal width."""
+
+    title = " YIKES! There's a bug! ".center(width, "-")
+    msg = (
+        "If you are seeing this, then there is something wrong with "
+        "H.A.N.N.A.H and not your code. Please report this bug here: "
+        '"https://github.com/kaamiki/hannah/issues/new" so that we can '
+        "fix the issue at the earliest. It would be a great help if you "
+        "could provide the steps, traceback information or even a sample "
+        "code for reproducing this bug while submitting an issue."
+    )
+    wrapper = textwrap.TextWrapper(width)
+    return f"\n\n{title}\n{wrapper.fill(msg)}\n\n"
 
 
 class UnsupportedOperation(HannahException):
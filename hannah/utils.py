@@ -1,17 +1,34 @@
 """Utilities: Collection of utilities."""
 
+import inspect
 from threading import Lock
 from typing import Any
-from typing import Dict
+from typing import Hashable
+from typing import MutableMapping
+from weakref import WeakValueDictionary
 
 __all__ = ["SingletonMeta"]
 
+_VAR_KEYWORD = inspect.Parameter.VAR_KEYWORD
+
 
 class SingletonMeta(type):
     """Thread-safe implementation of singleton design pattern.
 
     It ensures only a ``single instance`` of the class is available
-    at runtime. See singletons_ in python and their implementations_.
+    at runtime for the same constructor arguments. See singletons_ in
+    python and their implementations_. Every class gets its own lock,
+    so creating the instances of unrelated classes never contends.
+    Calls with unhashable arguments always create a new instance.
+
+    The instances are only weakly referenced, so they are collected
+    once nothing else refers to them and the next call creates a new
+    one. Hold a reference for as long as the identity should persist.
+    Classes declaring ``__slots__`` need to include ``__weakref__``,
+    else a :py:exc:`TypeError` is raised when the class is created.
+    Subclasses of builtins like :py:class:`int` or :py:class:`tuple`,
+    which cannot be weakly referenced at all, keep their instances
+    alive for the lifetime of the class instead.
 
     .. code-block:: python
 
@@ -25,12 +42,84 @@ class SingletonMeta(type):
 
     """
 
-    instances: Dict["SingletonMeta", type] = {}
-    lock = Lock()
+    def __init__(cls, *args: Any, **kwargs: Any) -> None:
+        """Initialize the lock and instances of the class."""
+
+        super().__init__(*args, **kwargs)
+        instances: MutableMapping[Hashable, type]
+        if cls.__weakrefoffset__:
+            instances = WeakValueDictionary()
+        elif "__slots__" in cls.__dict__ and not cls.__itemsize__:
+            raise TypeError(
+                f"{cls.__name__} instances must support weak references, "
+                "add '__weakref__' to its __slots__"
+            )
+        else:
+            instances = {}
+        cls._singleton_lock = Lock()
+        init = cls.__init__  # type: ignore
+        cls._singleton_signature = inspect.signature(init)
+        cls._singleton_instances = instances
+
+    def _singleton_key(cls, *args: Any, **kwargs: Any) -> Hashable:
+        """Return the key identifying the instance for the arguments.
+
+        The arguments are bound to the signature of ``__init__`` so the
+        same values passed positionally or by keyword share an instance.
+        If they do not match the signature or are unhashable once
+        bound, the raw arguments are used as the key instead.
+
+        Classes can define this as a classmethod to canonicalize their
+        arguments, e.g. to resolve a filename with ``os.path.realpath``.
+
+        """
+
+        raw = args, tuple(sorted(kwargs.items()))
+        signature = cls._singleton_signature
+        try:
+            bound = signature.bind(None, *args, **kwargs)
+        except TypeError:
+            return raw
+        bound.apply_defaults()
+        key = tuple(
+            (
+                (name, tuple(sorted(value.items())))
+                if signature.parameters[name].kind is _VAR_KEYWORD
+                else (name, value)
+            )
+            for name, value in list(bound.arguments.items())[1:]
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return raw
+        return key
 
     def __call__(cls, *args: Any, **kwargs: Any) -> type:
-        """Callable singleton instance."""
-        with cls.lock:
-            if cls not in cls.instances:
-                cls.instances[cls] = super().__call__(*args, **kwargs)
-        return cls.instances[cls]
+        """Callable singleton instance.
+
+        The instances are looked up by the raw arguments first, so the
+        lock and :py:meth:`_singleton_key` are only used while the
+        instance for them does not exist yet. Calls whose key cannot be
+        hashed create a new instance which is not cached.
+
+        """
+        raw: Any = args, tuple(sorted(kwargs.items()))
+        try:
+            instance = cls._singleton_instances.get(raw)
+        except TypeError:
+            raw = instance = None
+        if instance is not None:
+            return instance
+        with cls._singleton_lock:
+            key = cls._singleton_key(*args, **kwargs)
+            try:
+                instance = cls._singleton_instances.get(key)
+            except TypeError:
+                return super().__call__(*args, **kwargs)  # type: ignore
+            if instance is None:
+                instance = super().__call__(*args, **kwargs)
+                cls._singleton_instances[key] = instance
+            if raw is not None:
+                cls._singleton_instances[raw] = instance
+            return instance
@@ -43,3 +43,19 @@ def test_hannah_exception(
 ) -> None:
     with pytest.raises(exc, match=match):  # type: ignore
         dummy_func(exc, msg, valid)
+
+
+def test_hannah_exception_without_msg() -> None:
+    exc = HannahException()
+    assert str(exc) == ""
+    assert HannahException.msg == ""
+
+
+@pytest.mark.parametrize(("valid", "reported"), ((True, False), (False, True)))
+def test_hannah_exception_renders_once(valid: bool, reported: bool) -> None:
+    exc = HannahException(msg="Failed with code {code}", code=42, valid=valid)
+    text = str(exc)
+    assert text.startswith("Failed with code 42")
+    assert ("https://github.com/" in text) is reported
+    exc.code = 0  # type: ignore
+    assert str(exc) is text
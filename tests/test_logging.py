@@ -1,8 +1,21 @@
+import io
+import logging
 import pytest
+import threading
+import time
 import typing
+import warnings
 
+from hannah import FileHandler
+from hannah import Handler
 from hannah import Logger
+from hannah import QueueHandler
+from hannah import RotatingFileHandler
+from hannah import StackFormatter
+from hannah import StreamHandler
 from hannah import create_logger
+from hannah import get_logger
+from hannah import refresh_cwd
 
 
 def dummy_log_function(
@@ -13,7 +26,7 @@ def dummy_log_function(
 
 default_formatter_expected_msg = (
     "{} [MainThread] tests.test_logging."
-    "dummy_log_function:11 : Test {} message with default formatter\n"
+    "dummy_log_function:24 : Test {} message with default formatter\n"
 )
 
 
@@ -127,3 +140,135 @@ def test_with_extra_args(
     dummy_log_function(logger, msg, level, addr="127.0.0.1", port=6969)
     _, stderr = capsys.readouterr()
     assert stderr == expected
+
+
+def test_create_logger_reuses_handlers() -> None:
+    logger = create_logger(format="%(message)s")
+    handlers = logger.logger.handlers[:]
+    assert create_logger(format="%(message)s") is logger
+    assert logger.logger.handlers == handlers
+    logging.getLogger().setLevel(logging.CRITICAL)
+    logging.captureWarnings(False)
+    assert create_logger(format="%(message)s") is logger
+    assert logging.getLogger().level == logging.INFO
+    assert warnings.showwarning.__module__ == "logging"
+    assert create_logger(format="%(levelname)s %(message)s") is not logger
+    assert logger.logger.handlers != handlers
+
+
+def test_non_tty_record_uses_formatter_converter(
+    monkeypatch: typing.Any,
+) -> None:
+    monkeypatch.setenv("TZ", "Asia/Kolkata")
+    if hasattr(time, "tzset"):
+        time.tzset()
+    try:
+        formatter = StackFormatter(
+            "%(gray)s%(asctime)s %(color)s%(message)s%(reset)s", "%H:%M"
+        )
+        formatter.converter = time.gmtime
+        record = logging.LogRecord(
+            "root", logging.INFO, __file__, 1, "Test message", None, None
+        )
+        record.created = 6 * 3600.0
+        assert formatter.format(record) == "06:00 Test message"
+    finally:
+        monkeypatch.undo()
+        if hasattr(time, "tzset"):
+            time.tzset()
+
+
+def attach(handler: Handler, name: str) -> logging.Logger:
+    handler.handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler.add_handler(logger)
+    return logger
+
+
+def test_buffered_file_handler_flush(tmp_path: typing.Any) -> None:
+    path = tmp_path / "buffered.log"
+    handler = FileHandler(str(path), buffered=True)
+    handler.handler.flush_interval = float("inf")  # type: ignore
+    logger = attach(handler, "test_buffered_file_handler_flush")
+    logger.info("one")
+    logger.info("two")
+    assert "two" not in path.read_text()
+    handler.handler.flush()
+    assert path.read_text() == "one\ntwo\n"
+    logger.info("three")
+    handler.handler.close()
+    assert path.read_text() == "one\ntwo\nthree\n"
+
+
+def test_buffered_rotating_file_handler_rollover(
+    tmp_path: typing.Any,
+) -> None:
+    path = tmp_path / "rotating.log"
+    handler = RotatingFileHandler(
+        str(path), max_bytes=20, encoding="utf-8", buffered=True
+    )
+    logger = attach(handler, "test_buffered_rotating_file_handler_rollover")
+    for _ in range(3):
+        logger.info("\u00e9" * 4)
+    handler.handler.close()
+    line = "\u00e9" * 4 + "\n"
+    backup = tmp_path / "rotating.log.1"
+    assert backup.read_text(encoding="utf-8") == line * 2
+    assert path.read_text(encoding="utf-8") == line
+
+
+def test_queue_handler_dispatches_records() -> None:
+    stream = io.StringIO()
+    formatter = StackFormatter("%(message)s")
+    handler = QueueHandler([StreamHandler(stream, formatter=formatter)])
+    logger = get_logger("test_queue_handler_dispatches_records")
+    logger.logger.propagate = False
+    logger.logger.setLevel(logging.INFO)
+    handler.add_handler(logger.logger)
+    logger.info("Test %s message", "queued")
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logger.exception("Test exception message")
+    handler.handler.close()
+    info, trace = stream.getvalue().splitlines()
+    assert info == "Test queued message"
+    assert trace.startswith("ZeroDivisionError: division by zero line")
+
+
+def test_create_logger_stops_queue_listener() -> None:
+    threads = threading.active_count()
+    create_logger(stream=io.StringIO(), queue=True)
+    assert threading.active_count() == threads + 1
+    create_logger(stream=io.StringIO())
+    assert threading.active_count() == threads
+
+
+def test_disabled_level_skips_log(monkeypatch: typing.Any) -> None:
+    logger = Logger(logging.getLogger("test_disabled_level_skips_log"))
+    logger.logger.setLevel(logging.WARNING)
+    calls = []
+    monkeypatch.setattr(logger, "_log", lambda *args, **kw: calls.append(1))
+    logger.debug("Test %s message", "debug")
+    logger.info("Test %s message", "info")
+    assert calls == []
+    logger.warning("Test %s message", "warning")
+    assert calls == [1]
+
+
+def test_refresh_cwd(monkeypatch: typing.Any, tmp_path: typing.Any) -> None:
+    formatter = StackFormatter("%(stack)s")
+    path = str(tmp_path / "package" / "module.py")
+    record = logging.LogRecord(
+        "root", logging.INFO, path, 1, "Test message", None, None, "run"
+    )
+    monkeypatch.chdir(tmp_path)
+    try:
+        assert formatter.format(record) != "package.module.run"
+        refresh_cwd()
+        assert formatter.format(record) == "package.module.run"
+    finally:
+        monkeypatch.undo()
+        refresh_cwd()
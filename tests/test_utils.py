@@ -1,3 +1,7 @@
+import gc
+import pytest
+import typing
+
 from hannah import SingletonMeta
 
 
@@ -10,3 +14,85 @@ def test_singleton_instances() -> None:
     x2 = Foo()
     assert x1 == x2
     assert x1 is x2
+
+
+class Bar(metaclass=SingletonMeta):
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+
+def test_singleton_instances_per_arguments() -> None:
+    a = Bar("a")
+    b = Bar("b")
+    assert a is Bar("a")
+    assert a is Bar(name="a")
+    assert a is not b
+    assert (a.name, b.name) == ("a", "b")
+
+
+class Baz(metaclass=SingletonMeta):
+    def __init__(self, items: typing.List[int]) -> None:
+        self.items = items
+
+
+def test_singleton_instances_with_unhashable_arguments() -> None:
+    x = Baz([1])
+    y = Baz([2])
+    assert x is not y
+    assert x is not Baz([1])
+    assert (x.items, y.items) == ([1], [2])
+
+
+def test_singleton_signature_errors_pass_through() -> None:
+    with pytest.raises(TypeError, match="positional argument"):
+        Baz([1], [2], [3])  # type: ignore
+    with pytest.raises(TypeError, match="positional argument"):
+        Bar("a", "b")  # type: ignore
+
+
+class Counted(metaclass=SingletonMeta):
+    created = 0
+
+    def __init__(self) -> None:
+        type(self).created += 1
+
+
+def test_singleton_instance_is_recreated_once_collected() -> None:
+    x = Counted()
+    assert x is Counted()
+    assert Counted.created == 1
+    del x
+    gc.collect()
+    Counted()
+    assert Counted.created == 2
+
+
+def test_singleton_slots_require_weakref() -> None:
+    with pytest.raises(TypeError, match="__weakref__"):
+
+        class Slotted(metaclass=SingletonMeta):
+            __slots__ = ("name",)
+
+    class WeakSlotted(metaclass=SingletonMeta):
+        __slots__ = ("name", "__weakref__")
+
+    y = WeakSlotted()
+    assert y is WeakSlotted()
+
+
+def test_singleton_builtin_subclasses_are_strongly_cached() -> None:
+    class Number(int, metaclass=SingletonMeta):
+        pass
+
+    class Pair(tuple, metaclass=SingletonMeta):  # type: ignore
+        pass
+
+    x = Number(5)
+    ident = id(x)
+    assert x == 5
+    assert x is Number(5)
+    assert x is not Number(6)
+    assert Pair((1, 2)) is Pair((1, 2))
+    del x
+    gc.collect()
+    assert id(Number(5)) == ident